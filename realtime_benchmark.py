@@ -19,59 +19,180 @@ import threading
 import json
 import signal
 import sys
-from collections import deque
-import hashlib
-import queue
-from concurrent.futures import ThreadPoolExecutor
-import uuid
 import os
+import ctypes
+import errno
+import mmap
+import multiprocessing
+from multiprocessing import shared_memory
 
-class RealtimeBenchmark:
+# Native hashing kernels (src/bench/RealtimeBenchNative.cpp), loaded via ctypes
+NATIVE_LIB_NAME = 'libquids_bench_native.dylib' if sys.platform == 'darwin' else 'libquids_bench_native.so'
+NATIVE_LIB_PATH = os.environ.get(
+    'QUIDS_BENCH_NATIVE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build', NATIVE_LIB_NAME),
+)
+try:
+    native = ctypes.CDLL(NATIVE_LIB_PATH)
+except OSError as e:
+    print(f"Native hashing library missing: {e}")
+    print("Please build it first:")
+    print("cmake --build build --target quids_bench_native")
+    exit(1)
+
+# ctypes drops the GIL for the duration of each foreign call, so processor
+# threads hash their batches in parallel
+native.quids_process_batch.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_void_p]
+native.quids_process_batch.restype = ctypes.c_size_t
+native.quids_fill_random.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+native.quids_fill_random.restype = None
+native.quids_atomic_load.argtypes = [ctypes.c_void_p]
+native.quids_atomic_load.restype = ctypes.c_uint64
+native.quids_atomic_store.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+native.quids_atomic_store.restype = None
+native.quids_atomic_fetch_add.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+native.quids_atomic_fetch_add.restype = ctypes.c_uint64
+native.quids_atomic_cas.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_uint64]
+native.quids_atomic_cas.restype = ctypes.c_int
+
+# getrandom(2) fills a whole slot with kernel entropy per call; libcs without
+# it (macOS, glibc < 2.25) fall back to reading /dev/urandom
+libc = ctypes.CDLL(None, use_errno=True)
+getrandom = getattr(libc, 'getrandom', None)
+if getrandom is not None:
+    getrandom.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint]
+    getrandom.restype = ctypes.c_ssize_t
+
+TX_SIZE = 256
+TX_LANES = 4  # Transactions per interleaved group in a slab
+RNG_LANES = 4  # xorshift128+ streams in quids_fill_random (RNG_LANES in the C++ file)
+DIGEST_SIZE = 32
+HUGE_PAGE_SIZE = 2 * 1024 * 1024
+MAP_HUGETLB = getattr(mmap, 'MAP_HUGETLB', 0x40000)  # Linux value, not exported by mmap before 3.13
+
+# Anonymous mapping for the ring slabs: hugetlbfs pages if reserved, else a
+# transparent huge page hint, so payloads span few TLB entries
+def map_slab(size):
+    size = -(-size // HUGE_PAGE_SIZE) * HUGE_PAGE_SIZE
+    flags = mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS
+    if sys.platform.startswith('linux'):
+        try:
+            return mmap.mmap(-1, size, flags=flags | MAP_HUGETLB)
+        except OSError:
+            pass  # No hugetlbfs pages reserved (vm.nr_hugepages)
+    slab = mmap.mmap(-1, size, flags=flags)
+    if hasattr(mmap, 'MADV_HUGEPAGE'):
+        try:
+            slab.madvise(mmap.MADV_HUGEPAGE)
+        except OSError:
+            pass
+    return slab
+
+def slot_bytes(batch_size):
+    # Rounded up to whole interleaved groups
+    return -(-batch_size // TX_LANES) * TX_LANES * TX_SIZE
+
+# One token per published slot across a set of rings, on a semaphore-mode
+# eventfd (a pipe where eventfd is unavailable) so idle consumers block
+class ReadySignal:
     def __init__(self):
-        self.target_tps = 1_000_000
-        self.current_tps = 0
-        self.peak_tps = 0
-        self.running = True
-        self.transaction_count = 0
-        self.last_count_time = time.time()
-        self.start_time = time.time()
-        
-        # Transaction processing queues and pools
-        self.tx_queue = queue.Queue(maxsize=1_000_000)
-        self.result_queue = queue.Queue()
-        self.thread_pool = ThreadPoolExecutor(max_workers=psutil.cpu_count())
-        self.processing_threads = []
-        
-        # Use deques with max length for data storage
-        self.max_points = 600
-        self.timestamps = deque(maxlen=self.max_points)
-        self.tps_values = deque(maxlen=self.max_points)
-        self.cpu_usage = deque(maxlen=self.max_points)
-        self.memory_usage = deque(maxlen=self.max_points)
-        
-        # Performance parameters
-        self.params = {
-            'batch_size': 10000,
-            'num_threads': psutil.cpu_count(),
-            'parallel_chains': 32,
-            'memory_pool_size': 10_000_000,
-        }
-        
-        # Adjust batch size based on target TPS
-        min_batch = 5000
-        max_batch = 50000
-        self.params['batch_size'] = min(max_batch, max(min_batch, self.target_tps // 100))
-        
-        # Setup signal handler
-        signal.signal(signal.SIGINT, self.signal_handler)
-        
-        # Initialize plots
+        if hasattr(os, 'eventfd'):
+            self._wait_fd = self._post_fd = os.eventfd(0, os.EFD_SEMAPHORE)
+            self._token = (1).to_bytes(8, sys.byteorder)
+        else:
+            self._wait_fd, self._post_fd = os.pipe()
+            self._token = b'\x01'
+        self._token_size = len(self._token)
+
+    def post(self):
+        os.write(self._post_fd, self._token)
+
+    # Consumer: block until a slot is published (or wake() is called)
+    def wait(self):
+        os.read(self._wait_fd, self._token_size)
+
+    # Post count tokens with no slot behind them, to unblock waiting consumers
+    def wake(self, count):
+        for _ in range(count):
+            os.write(self._post_fd, self._token)
+
+    def close(self):
+        for fd in {self._wait_fd, self._post_fd}:
+            os.close(fd)
+
+# Lock-free single-producer / multi-consumer ring of transaction slabs, one
+# per-slot sequence number each (ticket = ready to fill, +1 = filled, +slots = freed)
+class TxRing:
+    def __init__(self, slots, batch_size, ready, slab):
+        self.slots = slots
+        self.batch_size = batch_size
+        self.slot_bytes = slot_bytes(batch_size)
+        self.slab = slab  # slots * slot_bytes of a shared map_slab mapping
+        self.seqs = multiprocessing.RawArray('Q', range(slots))
+        self.tail = multiprocessing.RawArray('Q', 1)
+        self.head = 0  # Only touched by the producer
+
+        self.slab_addr = ctypes.addressof(ctypes.c_char.from_buffer(self.slab))
+        self.views = [memoryview(self.slab)[i * self.slot_bytes:(i + 1) * self.slot_bytes]
+                      for i in range(slots)]
+        self._seqs_addr = ctypes.addressof(self.seqs)
+        self._tail_addr = ctypes.addressof(self.tail)
+        self.ready = ready
+
+    def view(self, ticket):
+        return self.views[ticket % self.slots]
+
+    def slot_addr(self, ticket):
+        return self.slab_addr + (ticket % self.slots) * self.slot_bytes
+
+    # Producer: ticket of the next slot to fill, or None if the ring is full
+    def claim(self):
+        ticket = self.head
+        if native.quids_atomic_load(self._seqs_addr + 8 * (ticket % self.slots)) != ticket:
+            return None
+        return ticket
+
+    def publish(self, ticket):
+        native.quids_atomic_store(self._seqs_addr + 8 * (ticket % self.slots), ticket + 1)
+        self.head = ticket + 1
+        self.ready.post()
+
+    # Consumer: CAS-claim the ticket at the tail if it is filled, else None
+    def acquire(self):
+        while True:
+            ticket = native.quids_atomic_load(self._tail_addr)
+            if native.quids_atomic_load(self._seqs_addr + 8 * (ticket % self.slots)) != ticket + 1:
+                return None
+            if native.quids_atomic_cas(self._tail_addr, ticket, ticket + 1):
+                return ticket
+
+    def release(self, ticket):
+        native.quids_atomic_store(self._seqs_addr + 8 * (ticket % self.slots), ticket + self.slots)
+
+# Rows of the shared stats block written by the benchmark and read by the plot
+STATS_ROWS = 4  # timestamps, tps, cpu, memory
+
+# Shared stats block: a sample counter, then STATS_ROWS circular buffers with
+# every sample stored twice, max_points apart, so the window is one slice
+def stats_arrays(buf, max_points):
+    sample_count = np.ndarray((1,), dtype=np.uint64, buffer=buf)
+    stats = np.ndarray((STATS_ROWS, 2 * max_points), dtype=np.float64, buffer=buf, offset=8)
+    return sample_count, stats
+
+def stats_window(count, max_points):
+    if count < max_points:
+        return slice(0, count)
+    start = count % max_points
+    return slice(start, start + max_points)
+
+# Live TPS and resource plot, driven from the shared stats block
+class BenchmarkPlot:
+    def __init__(self, buf, max_points, target_tps):
+        self.max_points = max_points
+        self.target_tps = target_tps
+        self.sample_count, self.stats = stats_arrays(buf, max_points)
         self.setup_plots()
 
-    def signal_handler(self, signum, frame):
-        print("\nShutting down gracefully...")
-        self.stop_benchmark()
-        
     def setup_plots(self):
         self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(12, 8))
         
@@ -92,145 +213,337 @@ class RealtimeBenchmark:
         self.ax2.grid(True)
         self.ax2.legend()
         
+        # Target TPS reference line
+        self.target_line = self.ax1.axhline(y=self.target_tps, color='r', linestyle='--', alpha=0.5)
+        
         plt.tight_layout()
         
     def update_plot(self, frame):
         try:
-            # Calculate elapsed time
-            current_time = time.time() - self.start_time
-            
-            # Add new data points
-            self.timestamps.append(current_time)
-            self.tps_values.append(self.current_tps)
-            self.cpu_usage.append(psutil.cpu_percent())
-            self.memory_usage.append(psutil.virtual_memory().percent)
+            count = int(self.sample_count[0])
+            if count == 0:
+                return self.tps_line, self.cpu_line, self.memory_line, self.target_line
+            timestamps, tps_values, cpu_usage, memory_usage = self.stats[:, stats_window(count, self.max_points)]
             
             # Update TPS plot
-            self.tps_line.set_data(list(self.timestamps), list(self.tps_values))
+            self.tps_line.set_data(timestamps, tps_values)
             self.ax1.relim()
             self.ax1.autoscale_view()
             
             # Set reasonable TPS range
-            max_tps = max(max(self.tps_values, default=0), 1)
+            max_tps = max(tps_values.max(), 1)
             target_line = min(max_tps * 1.2, self.target_tps * 1.2)
             self.ax1.set_ylim(0, target_line)
             
-            # Add target TPS line if within view
-            if not hasattr(self, 'target_line'):
-                self.target_line = self.ax1.axhline(y=self.target_tps, color='r', linestyle='--', alpha=0.5)
-            
             # Update resource usage plot
-            self.cpu_line.set_data(list(self.timestamps), list(self.cpu_usage))
-            self.memory_line.set_data(list(self.timestamps), list(self.memory_usage))
+            self.cpu_line.set_data(timestamps, cpu_usage)
+            self.memory_line.set_data(timestamps, memory_usage)
             self.ax2.relim()
             self.ax2.autoscale_view()
             self.ax2.set_ylim(0, 100)
             
             # Keep x-axis showing last 60 seconds
-            if self.timestamps:
-                x_max = max(self.timestamps)
-                self.ax1.set_xlim(max(0, x_max - 60), x_max)
-                self.ax2.set_xlim(max(0, x_max - 60), x_max)
+            x_max = timestamps[-1]
+            self.ax1.set_xlim(max(0, x_max - 60), x_max)
+            self.ax2.set_xlim(max(0, x_max - 60), x_max)
             
             return self.tps_line, self.cpu_line, self.memory_line, self.target_line
             
         except Exception as e:
             print(f"Error updating plot: {e}")
             return self.tps_line, self.cpu_line, self.memory_line, self.target_line
+
+# Entry point of the plotting process; the benchmark process stays headless
+def plot_main(shm_name, max_points, target_tps):
+    # Ctrl+C is handled by the benchmark process, which terminates this one
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    plot = BenchmarkPlot(shm.buf, max_points, target_tps)
+    anim = animation.FuncAnimation(
+        plot.fig,
+        plot.update_plot,
+        interval=100,  # Update every 100ms
+        blit=True,
+        cache_frame_data=False  # Disable frame caching
+    )
     
-    def process_transaction(self, tx_data):
-        try:
-            # Simulate actual blockchain work
-            # 1. Hash the transaction
-            tx_hash = hashlib.blake2b(tx_data).digest()
-            
-            # 2. Verify digital signature (simulated)
-            sig_verify = hashlib.sha3_256(tx_hash).digest()
-            
-            # 3. State transition computation
-            state_update = hashlib.sha3_512(sig_verify + tx_hash).digest()
-            
-            # 4. Merkle tree update (simulated)
-            merkle_update = hashlib.blake2s(state_update).digest()
-            
-            return True
-        except Exception as e:
-            print(f"Transaction processing error: {e}")
-            return False
+    # Show plot (this blocks until window is closed)
+    plt.show()
 
-    def process_batch(self, batch):
-        results = []
-        for tx in batch:
-            result = self.process_transaction(tx)
-            results.append(result)
-        return results
+class RealtimeBenchmark:
+    def __init__(self):
+        self.target_tps = 1_000_000
+        self.current_tps = 0
+        self.peak_tps = 0
+        self._tps_sum = 0  # Running total of sampled TPS, for the average in cleanup
+        self.running = True
+        self.transaction_count = 0
+        self.last_count_time = time.time()
+        self.start_time = time.time()
+        
+        # Processor threads hash outside the GIL in the native library and
+        # publish verified counts through a shared atomic counter
+        self.processed = multiprocessing.RawValue(ctypes.c_uint64, 0)
+        self.processed_addr = ctypes.addressof(self.processed)
+        self.processing_threads = []
+        
+        # Plot data lives in shared memory read by the separate plot process
+        self.max_points = 600
+        self.stats_shm = shared_memory.SharedMemory(
+            create=True, size=8 + STATS_ROWS * 2 * self.max_points * 8)
+        self.sample_count, self.stats = stats_arrays(self.stats_shm.buf, self.max_points)
+        self.sample_count[0] = 0
+        
+        # Performance parameters
+        self.params = {
+            'batch_size': 10000,
+            'num_threads': psutil.cpu_count(),
+            'parallel_chains': 32,
+            'memory_pool_size': 10_000_000,
+            'ring_slots': max(4, 2 * psutil.cpu_count()),
+            'payload_source': 'prng',  # 'prng' (xorshift128+) or 'urandom' (kernel entropy via getrandom)
+            'pin_threads': True,
+            'fifo_priority': False,  # SCHED_FIFO workers can starve the producer; needs CAP_SYS_NICE
+        }
+        
+        # Adjust batch size based on target TPS
+        min_batch = 5000
+        max_batch = 50000
+        self.params['batch_size'] = min(max_batch, max(min_batch, self.target_tps // 100))
+        
+        # Preallocated slabs: one ring per processor thread, fed round-robin by
+        # the producer; idle threads steal from their neighbours' rings
+        # A ring needs at least two slots, so ring_slots is raised to the
+        # real total when it is smaller than 2 * num_threads. All rings share
+        # one mapping, so the huge page rounding is paid once.
+        self.ready = ReadySignal()
+        num_rings = self.params['num_threads']
+        slots_per_ring = max(2, self.params['ring_slots'] // num_rings)
+        self.params['ring_slots'] = slots_per_ring * num_rings
+        ring_bytes = slots_per_ring * slot_bytes(self.params['batch_size'])
+        self.ring_slab = map_slab(num_rings * ring_bytes)
+        self.worker_rings = [
+            TxRing(slots_per_ring, self.params['batch_size'], self.ready,
+                   memoryview(self.ring_slab)[i * ring_bytes:(i + 1) * ring_bytes])
+            for i in range(num_rings)
+        ]
+        
+        # Payloads are generated straight into ring slots, no per-batch bytes objects
+        self.rng_state = (ctypes.c_uint64 * (2 * RNG_LANES)).from_buffer_copy(os.urandom(16 * RNG_LANES))
+        for lane in range(RNG_LANES):
+            self.rng_state[lane] |= 1  # xorshift128+ must not start from an all-zero state
+        self.urandom_fd = os.open('/dev/urandom', os.O_RDONLY) if getrandom is None else None
+        
+        # CPU / memory usage are read from /proc with descriptors opened once,
+        # falling back to psutil where /proc is not available
+        self.proc_buf = bytearray(4096)
+        self.stat_fd = self.meminfo_fd = None
+        if os.path.exists('/proc/stat') and os.path.exists('/proc/meminfo'):
+            self.stat_fd = os.open('/proc/stat', os.O_RDONLY)
+            self.meminfo_fd = os.open('/proc/meminfo', os.O_RDONLY)
+        self._prev_jiffies = (0, 0)  # (busy, total) at the previous sample
+        
+        # Setup signal handler
+        signal.signal(signal.SIGINT, self.signal_handler)
+
+
+    def signal_handler(self, signum, frame):
+        print("\nShutting down gracefully...")
+        self.stop_benchmark()
+        
+    # System-wide CPU usage since the previous call, from the first /proc/stat line
+    def cpu_percent(self):
+        if self.stat_fd is None:
+            return psutil.cpu_percent()
+        n = os.preadv(self.stat_fd, [self.proc_buf], 0)
+        # cpu  user nice system idle iowait irq softirq steal (guest time is already in user)
+        line = self.proc_buf[:self.proc_buf.find(b'\n', 0, n)]
+        jiffies = [int(v) for v in line.split()[1:9]]
+        total = sum(jiffies)
+        busy = total - jiffies[3] - jiffies[4]
+        prev_busy, prev_total = self._prev_jiffies
+        self._prev_jiffies = (busy, total)
+        if total == prev_total:
+            return 0.0
+        return 100.0 * (busy - prev_busy) / (total - prev_total)
+
+    # Share of memory in use, (MemTotal - MemAvailable) / MemTotal, from /proc/meminfo
+    def memory_percent(self):
+        if self.meminfo_fd is None:
+            return psutil.virtual_memory().percent
+        n = os.preadv(self.meminfo_fd, [self.proc_buf], 0)
+        total = available = 0
+        for line in self.proc_buf[:n].splitlines():
+            if line.startswith(b'MemTotal:'):
+                total = int(line.split()[1])
+            elif line.startswith(b'MemAvailable:'):
+                available = int(line.split()[1])
+                break
+        return 100.0 * (total - available) / total if total else 0.0
+
+    def record_sample(self):
+        # Calculate elapsed time
+        current_time = time.time() - self.start_time
+        
+        # Add new data points. Each sample goes to pos and pos + max_points;
+        # the copy outside the reader's current window is written first, then
+        # the count is bumped, then the copy that has just left the window, so
+        # the plot never draws a half-written sample (also once wrapped)
+        count = int(self.sample_count[0])
+        pos = count % self.max_points
+        first, second = (pos + self.max_points, pos) if count >= self.max_points else (pos, pos + self.max_points)
+        sample = (current_time, self.current_tps, self.cpu_percent(), self.memory_percent())
+        self.stats[:, first] = sample
+        self.sample_count[0] = count + 1
+        self.stats[:, second] = sample
+        self._tps_sum += self.current_tps
+    
+    def fill_prng(self, ring, ticket):
+        native.quids_fill_random(self.rng_state, ring.slot_addr(ticket), ring.slot_bytes)
+
+    def fill_urandom(self, ring, ticket):
+        if getrandom is None:
+            view = ring.view(ticket)
+            filled = 0
+            while filled < len(view):
+                filled += os.readv(self.urandom_fd, [view[filled:]])
+            return
+        # Large requests may come back short (signals, the ~32 MiB per-call cap)
+        addr = ring.slot_addr(ticket)
+        size = ring.slot_bytes
+        filled = 0
+        while filled < size:
+            n = getrandom(addr + filled, size - filled, 0)
+            if n < 0:
+                err = ctypes.get_errno()
+                if err != errno.EINTR:
+                    raise OSError(err, os.strerror(err))
+                continue
+            filled += n
+
+    # process_batch for this thread, with batch size, slot addresses and
+    # output buffers converted to ctypes values once instead of per batch
+    def make_batch_processor(self, digests, ok):
+        kernel = native.quids_process_batch
+        slots = self.worker_rings[0].slots
+        slot_addrs = [[ctypes.c_void_p(ring.slot_addr(i)) for i in range(slots)]
+                      for ring in self.worker_rings]
+        batch_size = ctypes.c_size_t(self.params['batch_size'])
+        digests_addr = ctypes.c_void_p(digests.ctypes.data)
+        ok_addr = ctypes.c_void_p(ok.ctypes.data)
+
+        def process_batch(ring_index, ticket):
+            # Simulate actual blockchain work: hashing and signature
+            # verification for the whole slot run natively, without the GIL
+            return kernel(slot_addrs[ring_index][ticket % slots], batch_size, digests_addr, ok_addr)
 
-    def transaction_processor(self):
+        return process_batch
+
+    # Claim a slot from the rings in victims order; the caller holds a ready
+    # token, so a rescan finds one unless stopped, which returns (None, None)
+    def next_batch(self, victims):
+        while self.running:
+            for ring_index, acquire in victims:
+                ticket = acquire()
+                if ticket is not None:
+                    return ring_index, ticket
+        return None, None
+
+    def transaction_processor(self, index):
+        # Output buffers reused for every batch this thread processes; the
+        # native call counts the verdict bytes itself, so no Python pass over ok
+        digests = np.empty(self.params['batch_size'] * DIGEST_SIZE, dtype=np.uint8)
+        ok = np.empty(self.params['batch_size'], dtype=np.uint8)
+        process_batch = self.make_batch_processor(digests, ok)
+        # Own ring first, then the neighbours' in order. The ready signal is
+        # shared, so each batch wakes whichever thread is blocked, not the
+        # ring's owner; this order only sets where a woken thread looks first
+        rings = self.worker_rings
+        victims = [((index + k) % len(rings), rings[(index + k) % len(rings)].acquire)
+                   for k in range(len(rings))]
+        wait = self.ready.wait
+        processed_addr = ctypes.c_void_p(self.processed_addr)
         while self.running:
             try:
-                # Get a batch of transactions
-                batch = []
-                try:
-                    while len(batch) < self.params['batch_size'] and not self.tx_queue.empty():
-                        batch.append(self.tx_queue.get_nowait())
-                except queue.Empty:
-                    if not batch:
-                        time.sleep(0.0001)
-                        continue
+                # Sleep until a slot is published in any ring, then claim one
+                wait()
+                ring_index, ticket = self.next_batch(victims)
+                if ticket is None:
+                    continue
 
-                # Process the batch
-                if batch:
-                    results = self.process_batch(batch)
-                    self.result_queue.put(len([r for r in results if r]))
+                # Process the batch and hand the slot back to the producer
+                processed = process_batch(ring_index, ticket)
+                rings[ring_index].release(ticket)
+                native.quids_atomic_fetch_add(processed_addr, processed)
             except Exception as e:
                 print(f"Processor thread error: {e}")
                 if not self.running:
                     break
 
+    # Keep a processor on one core so its BLAKE2b state and slab stay in cache
+    def pin_worker(self, tid, index):
+        if not hasattr(os, 'sched_setaffinity'):
+            return  # Linux only
+        try:
+            cores = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(tid, {cores[index % len(cores)]})
+            if self.params['fifo_priority']:
+                os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(1))
+        except OSError as e:
+            print(f"Could not pin processor thread {tid}: {e}")
+
     def submit_transactions(self):
         last_batch_time = time.time()
         last_tps_update = time.time()
         accumulated_tx = 0
+        last_processed = 0
         
         # Start processing threads
-        for _ in range(self.params['num_threads']):
-            thread = threading.Thread(target=self.transaction_processor)
+        for i in range(self.params['num_threads']):
+            thread = threading.Thread(target=self.transaction_processor, args=(i,))
             thread.daemon = True
             thread.start()
             self.processing_threads.append(thread)
+            if self.params['pin_threads']:
+                self.pin_worker(thread.native_id, i)
         
         # Calculate base batch interval
-        batch_interval = 1.0 / (self.target_tps / self.params['batch_size'])
-        min_interval = 0.0001
+        batch_size = self.params['batch_size']
+        batch_interval = 1.0 / (self.target_tps / batch_size)
+        min_interval = max(batch_interval, 0.0001)
+        
+        # Hoisted out of the hot loop: no dict or attribute lookups per batch
+        rings = self.worker_rings
+        next_ring = 0
+        fill = self.fill_prng if self.params['payload_source'] == 'prng' else self.fill_urandom
         
         while self.running:
             try:
                 current_time = time.time()
                 elapsed = current_time - last_batch_time
                 
-                if elapsed >= max(batch_interval, min_interval):
-                    # Generate and submit real transactions
-                    batch_size = self.params['batch_size']
-                    for _ in range(batch_size):
-                        # Create transaction with real data
-                        tx_data = os.urandom(256)  # Random 256 bytes
-                        try:
-                            self.tx_queue.put_nowait(tx_data)
-                        except queue.Full:
-                            time.sleep(0.0001)
-                            continue
+                if elapsed >= min_interval:
+                    # Generate and submit real transactions into the next
+                    # worker's ring, skipping rings that are full
+                    for k in range(len(rings)):
+                        ring = rings[(next_ring + k) % len(rings)]
+                        ticket = ring.claim()
+                        if ticket is not None:
+                            break
+                    else:
+                        time.sleep(0.0001)
+                        continue
+                    next_ring = (next_ring + k + 1) % len(rings)
+                    fill(ring, ticket)  # Random 256 bytes per tx
+                    ring.publish(ticket)
                     
                     accumulated_tx += batch_size
                     self.transaction_count += batch_size
                     
                     # Process results
-                    try:
-                        while not self.result_queue.empty():
-                            processed = self.result_queue.get_nowait()
-                            if processed > 0:
-                                accumulated_tx += processed
-                    except queue.Empty:
-                        pass
+                    processed = native.quids_atomic_load(self.processed_addr)
+                    accumulated_tx += processed - last_processed
+                    last_processed = processed
                     
                     # Update TPS every 100ms
                     if current_time - last_tps_update >= 0.1:
@@ -261,35 +574,31 @@ class RealtimeBenchmark:
         print("Benchmark running. Press Ctrl+C to stop...")
         
         try:
+            # Start the plot process first so it is forked before any threads exist
+            self.plot_process = multiprocessing.Process(
+                target=plot_main,
+                args=(self.stats_shm.name, self.max_points, self.target_tps),
+                daemon=True
+            )
+            self.plot_process.start()
+            
             # Start transaction submission in a separate thread
             self.tx_thread = threading.Thread(target=self.submit_transactions)
             self.tx_thread.daemon = True
             self.tx_thread.start()
             
-            # Create animation
-            self.anim = animation.FuncAnimation(
-                self.fig,
-                self.update_plot,
-                frames=self.generate_time(),
-                interval=100,  # Update every 100ms
-                blit=True,
-                cache_frame_data=False  # Disable frame caching
-            )
-            
-            # Show plot (this blocks until window is closed)
-            plt.show()
+            # Sample stats every 100ms until stopped or the plot window is closed
+            next_sample = time.time()
+            while self.running and self.plot_process.is_alive():
+                self.record_sample()
+                next_sample += 0.1
+                time.sleep(max(0, next_sample - time.time()))
             
         except KeyboardInterrupt:
             print("\nReceived keyboard interrupt. Stopping benchmark...")
         finally:
             self.cleanup()
     
-    def generate_time(self):
-        t = 0
-        while self.running:
-            yield t
-            t += 0.1  # 100ms between frames
-    
     def stop_benchmark(self):
         self.running = False
         if hasattr(self, 'tx_thread'):
@@ -298,19 +607,29 @@ class RealtimeBenchmark:
     def cleanup(self):
         print("Cleaning up...")
         try:
-            self.running = False
+            # Stop the producer first; it posts to the ready signal until it exits
+            self.stop_benchmark()
             
-            # Wait for processing threads to finish
+            # Wake processing threads blocked on the ring and wait for them to finish
+            self.ready.wake(len(self.processing_threads))
             for thread in self.processing_threads:
                 thread.join(timeout=1.0)
             
-            # Shutdown thread pool
-            self.thread_pool.shutdown(wait=False)
+            # Left open if a thread is still running, so it never hits a reused fd
+            threads = self.processing_threads + ([self.tx_thread] if hasattr(self, 'tx_thread') else [])
+            if not any(thread.is_alive() for thread in threads):
+                self.ready.close()
+                if self.urandom_fd is not None:
+                    os.close(self.urandom_fd)  # Read by the producer in fill_urandom
+            for fd in (self.stat_fd, self.meminfo_fd):
+                if fd is not None:
+                    os.close(fd)
             
             # Save results
+            count = int(self.sample_count[0])
             results = {
                 'peak_tps': self.peak_tps,
-                'avg_tps': float(np.mean(list(self.tps_values))) if self.tps_values else 0,
+                'avg_tps': self._tps_sum / max(1, count),
                 'final_params': self.params,
                 'processed_transactions': self.transaction_count
             }
@@ -319,8 +638,11 @@ class RealtimeBenchmark:
                 json.dump(results, f, indent=2)
             print("Results saved to benchmark_results.json")
             
-            # Close plots
-            plt.close('all')
+            # Close the plot window and release the shared stats
+            if hasattr(self, 'plot_process') and self.plot_process.is_alive():
+                self.plot_process.terminate()
+                self.plot_process.join(timeout=1.0)
+            self.stats_shm.unlink()
             
         except Exception as e:
             print(f"Error during cleanup: {e}")
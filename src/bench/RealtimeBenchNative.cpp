@@ -0,0 +1,388 @@
+// Native hashing kernels for realtime_benchmark.py
+//
+// Exposes a plain C ABI so the benchmark can load the shared library through
+// ctypes (same approach as vendors/sha3/wrapper). Transactions are hashed with
+// BLAKE2b-256; on AVX2 capable CPUs four transactions are compressed at once,
+// one transaction per 64-bit lane of a YMM register.
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+
+// QUIDS_BENCH_NO_AVX2 builds only the portable kernels (used to test them on AVX2 hosts)
+#if (defined(__x86_64__) || defined(__i386__)) && !defined(QUIDS_BENCH_NO_AVX2)
+#include <immintrin.h>
+#define QUIDS_HAVE_AVX2_KERNEL 1
+#endif
+
+namespace quids {
+namespace bench {
+namespace {
+
+constexpr size_t BLOCK_BYTES = 128;
+constexpr size_t DIGEST_BYTES = 32;
+constexpr size_t TX_BYTES = 256;
+constexpr size_t LANES = 4;
+constexpr size_t GROUP_BYTES = LANES * TX_BYTES;
+
+constexpr uint64_t IV[8] = {
+    0x6a09e667f3bcc908ULL, 0xbb67ae8584caa73bULL, 0x3c6ef372fe94f82bULL, 0xa54ff53a5f1d36f1ULL,
+    0x510e527fade682d1ULL, 0x9b05688c2b3e6c1fULL, 0x1f83d9abfb41bd6bULL, 0x5be0cd19137e2179ULL,
+};
+
+constexpr uint8_t SIGMA[12][16] = {
+    {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15},
+    {14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3},
+    {11, 8, 12, 0, 5, 2, 15, 13, 10, 14, 3, 6, 7, 1, 9, 4},
+    {7, 9, 3, 1, 13, 12, 11, 14, 2, 6, 5, 10, 4, 0, 15, 8},
+    {9, 0, 5, 7, 2, 4, 10, 15, 14, 1, 11, 12, 6, 8, 3, 13},
+    {2, 12, 6, 10, 0, 11, 8, 3, 4, 13, 7, 5, 15, 14, 1, 9},
+    {12, 5, 1, 15, 14, 13, 4, 10, 0, 7, 6, 3, 9, 2, 8, 11},
+    {13, 11, 7, 14, 12, 1, 3, 9, 5, 0, 15, 4, 8, 6, 2, 10},
+    {6, 15, 14, 9, 11, 3, 0, 8, 12, 2, 13, 7, 1, 4, 10, 5},
+    {10, 2, 8, 4, 7, 6, 1, 5, 15, 11, 9, 14, 3, 12, 13, 0},
+    {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15},
+    {14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3},
+};
+
+constexpr size_t RNG_LANES = 4;
+
+inline uint64_t load64(const uint8_t* src) {
+    uint64_t w;
+    std::memcpy(&w, src, sizeof(w));
+    return w;
+}
+
+inline uint64_t rotr64(uint64_t w, unsigned c) {
+    return (w >> c) | (w << (64 - c));
+}
+
+// Unkeyed BLAKE2b parameter block for a 32-byte digest, folded into the IV.
+// An optional personalization string (up to 16 bytes) separates hash domains.
+struct State {
+    uint64_t h[8];
+
+    explicit State(const char* personal = nullptr) {
+        for (int i = 0; i < 8; ++i) h[i] = IV[i];
+        h[0] ^= 0x01010000ULL ^ DIGEST_BYTES;
+        if (personal != nullptr) {
+            uint8_t p[16] = {};
+            std::memcpy(p, personal, std::min<size_t>(std::strlen(personal), sizeof(p)));
+            h[6] ^= load64(p);
+            h[7] ^= load64(p + 8);
+        }
+    }
+};
+
+// Number of compression calls needed for a message of `len` bytes
+inline size_t block_count(size_t len) {
+    return len == 0 ? 1 : (len + BLOCK_BYTES - 1) / BLOCK_BYTES;
+}
+
+#define QUIDS_G(a, b, c, d, x, y)         \
+    do {                                  \
+        a = a + b + (x);                  \
+        d = rotr64(d ^ a, 32);            \
+        c = c + d;                        \
+        b = rotr64(b ^ c, 24);            \
+        a = a + b + (y);                  \
+        d = rotr64(d ^ a, 16);            \
+        c = c + d;                        \
+        b = rotr64(b ^ c, 63);            \
+    } while (0)
+
+void compress(uint64_t h[8], const uint8_t* block, uint64_t counter, bool last) {
+    uint64_t m[16];
+    uint64_t v[16];
+    for (int i = 0; i < 16; ++i) m[i] = load64(block + 8 * i);
+    for (int i = 0; i < 8; ++i) {
+        v[i] = h[i];
+        v[i + 8] = IV[i];
+    }
+    v[12] ^= counter;
+    if (last) v[14] = ~v[14];
+
+    for (const auto& s : SIGMA) {
+        QUIDS_G(v[0], v[4], v[8], v[12], m[s[0]], m[s[1]]);
+        QUIDS_G(v[1], v[5], v[9], v[13], m[s[2]], m[s[3]]);
+        QUIDS_G(v[2], v[6], v[10], v[14], m[s[4]], m[s[5]]);
+        QUIDS_G(v[3], v[7], v[11], v[15], m[s[6]], m[s[7]]);
+        QUIDS_G(v[0], v[5], v[10], v[15], m[s[8]], m[s[9]]);
+        QUIDS_G(v[1], v[6], v[11], v[12], m[s[10]], m[s[11]]);
+        QUIDS_G(v[2], v[7], v[8], v[13], m[s[12]], m[s[13]]);
+        QUIDS_G(v[3], v[4], v[9], v[14], m[s[14]], m[s[15]]);
+    }
+
+    for (int i = 0; i < 8; ++i) h[i] ^= v[i] ^ v[i + 8];
+}
+
+#undef QUIDS_G
+
+void hash_one(const State& init, const uint8_t* in, size_t len, uint8_t* out) {
+    uint64_t h[8];
+    std::memcpy(h, init.h, sizeof(h));
+
+    const size_t blocks = block_count(len);
+    for (size_t b = 0; b + 1 < blocks; ++b) {
+        compress(h, in + b * BLOCK_BYTES, (b + 1) * BLOCK_BYTES, false);
+    }
+
+    uint8_t tail[BLOCK_BYTES] = {};
+    const size_t done = (blocks - 1) * BLOCK_BYTES;
+    std::memcpy(tail, in + done, len - done);
+    compress(h, tail, len, true);
+
+    std::memcpy(out, h, DIGEST_BYTES);
+}
+
+#ifdef QUIDS_HAVE_AVX2_KERNEL
+
+#define QUIDS_AVX2 __attribute__((target("avx2")))
+
+QUIDS_AVX2 inline __m256i rotr32(__m256i x) {
+    return _mm256_shuffle_epi32(x, _MM_SHUFFLE(2, 3, 0, 1));
+}
+
+QUIDS_AVX2 inline __m256i rotr24(__m256i x) {
+    const __m256i mask = _mm256_setr_epi8(
+        3, 4, 5, 6, 7, 0, 1, 2, 11, 12, 13, 14, 15, 8, 9, 10,
+        3, 4, 5, 6, 7, 0, 1, 2, 11, 12, 13, 14, 15, 8, 9, 10);
+    return _mm256_shuffle_epi8(x, mask);
+}
+
+QUIDS_AVX2 inline __m256i rotr16(__m256i x) {
+    const __m256i mask = _mm256_setr_epi8(
+        2, 3, 4, 5, 6, 7, 0, 1, 10, 11, 12, 13, 14, 15, 8, 9,
+        2, 3, 4, 5, 6, 7, 0, 1, 10, 11, 12, 13, 14, 15, 8, 9);
+    return _mm256_shuffle_epi8(x, mask);
+}
+
+QUIDS_AVX2 inline __m256i rotr63(__m256i x) {
+    return _mm256_or_si256(_mm256_srli_epi64(x, 63), _mm256_add_epi64(x, x));
+}
+
+// Turns four rows (one per lane) of four words into four columns of lane words
+QUIDS_AVX2 inline void transpose4(__m256i& r0, __m256i& r1, __m256i& r2, __m256i& r3) {
+    const __m256i t0 = _mm256_unpacklo_epi64(r0, r1);
+    const __m256i t1 = _mm256_unpackhi_epi64(r0, r1);
+    const __m256i t2 = _mm256_unpacklo_epi64(r2, r3);
+    const __m256i t3 = _mm256_unpackhi_epi64(r2, r3);
+    r0 = _mm256_permute2x128_si256(t0, t2, 0x20);
+    r1 = _mm256_permute2x128_si256(t1, t3, 0x20);
+    r2 = _mm256_permute2x128_si256(t0, t2, 0x31);
+    r3 = _mm256_permute2x128_si256(t1, t3, 0x31);
+}
+
+#define QUIDS_G4(a, b, c, d, x, y)                                  \
+    do {                                                            \
+        a = _mm256_add_epi64(_mm256_add_epi64(a, b), (x));          \
+        d = rotr32(_mm256_xor_si256(d, a));                         \
+        c = _mm256_add_epi64(c, d);                                 \
+        b = rotr24(_mm256_xor_si256(b, c));                         \
+        a = _mm256_add_epi64(_mm256_add_epi64(a, b), (y));          \
+        d = rotr16(_mm256_xor_si256(d, a));                         \
+        c = _mm256_add_epi64(c, d);                                 \
+        b = rotr63(_mm256_xor_si256(b, c));                         \
+    } while (0)
+
+QUIDS_AVX2 void compress4(__m256i h[8], const __m256i m[16], uint64_t counter, bool last) {
+    __m256i v[16];
+    for (int i = 0; i < 8; ++i) {
+        v[i] = h[i];
+        v[i + 8] = _mm256_set1_epi64x(static_cast<long long>(IV[i]));
+    }
+    v[12] = _mm256_xor_si256(v[12], _mm256_set1_epi64x(static_cast<long long>(counter)));
+    if (last) v[14] = _mm256_xor_si256(v[14], _mm256_set1_epi64x(-1));
+
+    for (const auto& s : SIGMA) {
+        QUIDS_G4(v[0], v[4], v[8], v[12], m[s[0]], m[s[1]]);
+        QUIDS_G4(v[1], v[5], v[9], v[13], m[s[2]], m[s[3]]);
+        QUIDS_G4(v[2], v[6], v[10], v[14], m[s[4]], m[s[5]]);
+        QUIDS_G4(v[3], v[7], v[11], v[15], m[s[6]], m[s[7]]);
+        QUIDS_G4(v[0], v[5], v[10], v[15], m[s[8]], m[s[9]]);
+        QUIDS_G4(v[1], v[6], v[11], v[12], m[s[10]], m[s[11]]);
+        QUIDS_G4(v[2], v[7], v[8], v[13], m[s[12]], m[s[13]]);
+        QUIDS_G4(v[3], v[4], v[9], v[14], m[s[14]], m[s[15]]);
+    }
+
+    for (int i = 0; i < 8; ++i) {
+        h[i] = _mm256_xor_si256(h[i], _mm256_xor_si256(v[i], v[i + 8]));
+    }
+}
+
+#undef QUIDS_G4
+
+// Writes the 32-byte digest of each lane
+QUIDS_AVX2 inline void store_digests(const __m256i h[8], uint8_t* const out[4]) {
+    __m256i d0 = h[0], d1 = h[1], d2 = h[2], d3 = h[3];
+    transpose4(d0, d1, d2, d3);
+    _mm256_storeu_si256(reinterpret_cast<__m256i*>(out[0]), d0);
+    _mm256_storeu_si256(reinterpret_cast<__m256i*>(out[1]), d1);
+    _mm256_storeu_si256(reinterpret_cast<__m256i*>(out[2]), d2);
+    _mm256_storeu_si256(reinterpret_cast<__m256i*>(out[3]), d3);
+}
+
+// Hashes one group of four lane-interleaved transactions (see quids_process_batch).
+// Word w of every lane is already adjacent, so message words are plain loads.
+QUIDS_AVX2 void hash_group(const State& init, const uint8_t* group, uint8_t* const out[4]) {
+    __m256i h[8];
+    for (int i = 0; i < 8; ++i) h[i] = _mm256_set1_epi64x(static_cast<long long>(init.h[i]));
+
+    constexpr size_t blocks = TX_BYTES / BLOCK_BYTES;
+    for (size_t b = 0; b < blocks; ++b) {
+        __m256i m[16];
+        for (int w = 0; w < 16; ++w) {
+            m[w] = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(group + (b * 16 + w) * 32));
+        }
+        compress4(h, m, (b + 1) * BLOCK_BYTES, b + 1 == blocks);
+    }
+
+    store_digests(h, out);
+}
+
+// Four xorshift128+ streams per YMM register, one per lane; writes whole
+// 32-byte chunks and returns how many bytes were filled
+QUIDS_AVX2 size_t fill_random4(uint64_t* state, uint8_t* buf, size_t len) {
+    __m256i s0 = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(state));
+    __m256i s1 = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(state + RNG_LANES));
+
+    size_t i = 0;
+    for (; i + 8 * RNG_LANES <= len; i += 8 * RNG_LANES) {
+        __m256i x = s0;
+        const __m256i y = s1;
+        s0 = y;
+        x = _mm256_xor_si256(x, _mm256_slli_epi64(x, 23));
+        s1 = _mm256_xor_si256(_mm256_xor_si256(x, y),
+                              _mm256_xor_si256(_mm256_srli_epi64(x, 17), _mm256_srli_epi64(y, 26)));
+        _mm256_storeu_si256(reinterpret_cast<__m256i*>(buf + i), _mm256_add_epi64(s1, y));
+    }
+
+    _mm256_storeu_si256(reinterpret_cast<__m256i*>(state), s0);
+    _mm256_storeu_si256(reinterpret_cast<__m256i*>(state + RNG_LANES), s1);
+    return i;
+}
+
+#undef QUIDS_AVX2
+
+bool cpu_has_avx2() {
+    static const bool supported = __builtin_cpu_supports("avx2");
+    return supported;
+}
+
+#endif // QUIDS_HAVE_AVX2_KERNEL
+
+// Copies transaction i out of a lane-interleaved slab into contiguous bytes
+void gather_tx(const uint8_t* slab, size_t i, uint8_t* tx) {
+    const uint8_t* group = slab + (i / LANES) * GROUP_BYTES;
+    const size_t lane = i % LANES;
+    for (size_t w = 0; w < TX_BYTES / 8; ++w) {
+        std::memcpy(tx + 8 * w, group + (w * LANES + lane) * 8, 8);
+    }
+}
+
+// Hashes n transactions stored lane-interleaved in groups of four
+void hash_interleaved(const State& init, const uint8_t* slab, size_t n, uint8_t* out) {
+    size_t i = 0;
+#ifdef QUIDS_HAVE_AVX2_KERNEL
+    if (cpu_has_avx2()) {
+        for (; i + LANES <= n; i += LANES) {
+            uint8_t* const digests[4] = {
+                out + i * DIGEST_BYTES, out + (i + 1) * DIGEST_BYTES,
+                out + (i + 2) * DIGEST_BYTES, out + (i + 3) * DIGEST_BYTES};
+            hash_group(init, slab + (i / LANES) * GROUP_BYTES, digests);
+        }
+    }
+#endif
+    for (; i < n; ++i) {
+        uint8_t tx[TX_BYTES];
+        gather_tx(slab, i, tx);
+        hash_one(init, tx, TX_BYTES, out + i * DIGEST_BYTES);
+    }
+}
+
+// Simulated signature check: a transaction verifies when the first byte of its
+// digest is non-zero. Writes one verdict byte per transaction, returns how many passed
+size_t verify_digests(const uint8_t* digests, size_t n, uint8_t* ok) {
+    size_t total = 0;
+    for (size_t i = 0; i < n; ++i) {
+        ok[i] = digests[i * DIGEST_BYTES] != 0;
+        total += ok[i];
+    }
+    return total;
+}
+
+inline uint64_t xorshift128p(uint64_t& s0, uint64_t& s1) {
+    uint64_t x = s0;
+    const uint64_t y = s1;
+    s0 = y;
+    x ^= x << 23;
+    s1 = x ^ y ^ (x >> 17) ^ (y >> 26);
+    return s1 + y;
+}
+
+void fill_random(uint64_t* state, uint8_t* buf, size_t len) {
+    size_t i = 0;
+#ifdef QUIDS_HAVE_AVX2_KERNEL
+    if (cpu_has_avx2()) i = fill_random4(state, buf, len);
+#endif
+    for (; i < len; i += 8 * RNG_LANES) {
+        uint64_t chunk[RNG_LANES];
+        for (size_t l = 0; l < RNG_LANES; ++l) chunk[l] = xorshift128p(state[l], state[RNG_LANES + l]);
+        std::memcpy(buf + i, chunk, len - i < sizeof(chunk) ? len - i : sizeof(chunk));
+    }
+}
+
+} // namespace
+} // namespace bench
+} // namespace quids
+
+extern "C" {
+
+// Runs the simulated per-transaction pipeline over a slab of n 256-byte
+// transactions. Hashing and signature verification are fused into a single
+// BLAKE2b pass per payload, kept in its own domain by the "quids-fused"
+// personalization. `digests` receives n 32-byte results and `ok` one verdict
+// byte per transaction (1 when the digest's first byte is non-zero). Returns
+// the number of transactions that verified.
+//
+// The slab is lane-interleaved (SoA) in groups of four transactions: 64-bit
+// word w of transaction i lives at (i / 4) * 1024 + w * 32 + (i % 4) * 8, so
+// the AVX2 kernel reads each message word of four lanes with a single load.
+// A partial final group still occupies a full 1024 bytes.
+size_t quids_process_batch(const uint8_t* txs, size_t n, uint8_t* digests, uint8_t* ok) {
+    using namespace quids::bench;
+    static const State fused("quids-fused");
+
+    hash_interleaved(fused, txs, n, digests);
+    return verify_digests(digests, n, ok);
+}
+
+// Fills `len` bytes of `buf` from four interleaved xorshift128+ streams whose
+// state (eight words: s0 of every lane, then s1 of every lane) is advanced in
+// place. Benchmark payloads only, not suitable for anything needing real entropy.
+void quids_fill_random(uint64_t* state, uint8_t* buf, size_t len) {
+    quids::bench::fill_random(state, buf, len);
+}
+
+// Atomic helpers for the benchmark's shared-memory ring buffer. All operate on
+// 64-bit words owned by the caller (e.g. a multiprocessing.RawArray).
+uint64_t quids_atomic_load(const uint64_t* p) {
+    return __atomic_load_n(p, __ATOMIC_ACQUIRE);
+}
+
+void quids_atomic_store(uint64_t* p, uint64_t value) {
+    __atomic_store_n(p, value, __ATOMIC_RELEASE);
+}
+
+// Adds `value` to *p and returns the previous value
+uint64_t quids_atomic_fetch_add(uint64_t* p, uint64_t value) {
+    return __atomic_fetch_add(p, value, __ATOMIC_ACQ_REL);
+}
+
+// Returns 1 if *p held `expected` and now holds `desired`, 0 otherwise
+int quids_atomic_cas(uint64_t* p, uint64_t expected, uint64_t desired) {
+    return __atomic_compare_exchange_n(p, &expected, desired, false, __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE);
+}
+
+}
@@ -0,0 +1,138 @@
+#include <gtest/gtest.h>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <string>
+#include <vector>
+
+// C ABI of src/bench/RealtimeBenchNative.cpp, as loaded by realtime_benchmark.py
+extern "C" {
+size_t quids_process_batch(const uint8_t* txs, size_t n, uint8_t* digests, uint8_t* ok);
+void quids_fill_random(uint64_t* state, uint8_t* buf, size_t len);
+}
+
+namespace {
+
+constexpr size_t TX_BYTES = 256;
+constexpr size_t DIGEST_BYTES = 32;
+constexpr size_t LANES = 4;
+
+// BLAKE2b-256 with personalization "quids-fused" of tx(i) below, from
+// hashlib.blake2b(tx, digest_size=32, person=b'quids-fused'). Transaction 9
+// has a leading zero byte and therefore fails verification.
+const char* const EXPECTED_DIGESTS[] = {
+    "bbb977e33dcb31cf301a948e3c05868eb0528f7cd4bda765c0a6020de94d082c",
+    "427ab34d8793f8c41894796e35f6e7d7b249ea973a38e17e637e373121abb418",
+    "7856eb27aafbb612c559288f13aa69b61b128f121983a474f1fbf2e065bde67d",
+    "b6048e6319a81b7818a59686399e265622ccc295c0fc87301d6d614264702ebb",
+    "4f3199896bcff82c73562040451100dc4c7e01d5faa4e310b7d34be582f8d692",
+    "e5e71f889306f8150363097c9cd01656d2e6710415ddc5ca146ef1634ea3ab32",
+    "46c1d4ee2a56e2e4ac17c523a5225f3d5277ae2b50aa644e95bf273df4eea06f",
+    "97840c70c86221b7d4b1342317c3efcc63c16849b0f21e267c3023c5212c1877",
+    "27641086a90a6866a55bd01b5e0fe7522702f994cd900897c24018b94d2fb85f",
+    "00557372f9f73bd546c6140737dbbc34d69767e9af6f319e1e9ef66b015b1c4d",
+    "b8689e5a212ff5a09abc1fc1b84d5cb4988545a3f1e3357510cb8a9e2673d99b",
+    "dc9befe8bf4b3e599f0a741ee654d08d144aee259660fc01d8da6811aabfa0e7",
+    "d096c0d95777c3006856c11f9d278c9921748f4a59514357b4261aeece49e657",
+};
+constexpr size_t MAX_TXS = sizeof(EXPECTED_DIGESTS) / sizeof(EXPECTED_DIGESTS[0]);
+
+uint8_t tx_byte(size_t i, size_t j) {
+    const uint32_t x = static_cast<uint32_t>((i + 1) * (j + 84)) * 2654435761u;
+    return static_cast<uint8_t>(x >> 13);
+}
+
+// Lane-interleaved slab: word w of transaction i at (i / 4) * 1024 + w * 32 + (i % 4) * 8.
+// Unused lanes of a partial group are filled with junk, which must not be hashed.
+std::vector<uint8_t> interleaved_slab(size_t n) {
+    const size_t groups = (n + LANES - 1) / LANES;
+    std::vector<uint8_t> slab(groups * LANES * TX_BYTES, 0xA5);
+    for (size_t i = 0; i < n; ++i) {
+        for (size_t j = 0; j < TX_BYTES; ++j) {
+            const size_t w = j / 8;
+            slab[(i / LANES) * LANES * TX_BYTES + (w * LANES + i % LANES) * 8 + j % 8] = tx_byte(i, j);
+        }
+    }
+    return slab;
+}
+
+std::string to_hex(const uint8_t* bytes, size_t len) {
+    std::string hex;
+    char byte[3];
+    for (size_t i = 0; i < len; ++i) {
+        std::snprintf(byte, sizeof(byte), "%02x", bytes[i]);
+        hex += byte;
+    }
+    return hex;
+}
+
+uint64_t xorshift128p(uint64_t& s0, uint64_t& s1) {
+    uint64_t x = s0;
+    const uint64_t y = s1;
+    s0 = y;
+    x ^= x << 23;
+    s1 = x ^ y ^ (x >> 17) ^ (y >> 26);
+    return s1 + y;
+}
+
+} // namespace
+
+// Every batch size up to three full groups plus a partial one, so both the
+// four-lane kernel and the single-transaction tail are covered
+TEST(RealtimeBenchNativeTest, ProcessBatchMatchesKnownDigests) {
+    for (size_t n = 1; n <= MAX_TXS; ++n) {
+        SCOPED_TRACE("n = " + std::to_string(n));
+        const std::vector<uint8_t> slab = interleaved_slab(n);
+        std::vector<uint8_t> digests(n * DIGEST_BYTES);
+        std::vector<uint8_t> ok(n, 0xFF);
+
+        const size_t verified = quids_process_batch(slab.data(), n, digests.data(), ok.data());
+
+        size_t expected_verified = 0;
+        for (size_t i = 0; i < n; ++i) {
+            EXPECT_EQ(to_hex(&digests[i * DIGEST_BYTES], DIGEST_BYTES), EXPECTED_DIGESTS[i]) << "tx " << i;
+            const uint8_t expected_ok = digests[i * DIGEST_BYTES] != 0;
+            EXPECT_EQ(ok[i], expected_ok) << "tx " << i;
+            expected_verified += expected_ok;
+        }
+        EXPECT_EQ(verified, expected_verified);
+    }
+}
+
+TEST(RealtimeBenchNativeTest, ProcessBatchRejectsLeadingZeroDigest) {
+    const size_t n = 10;
+    const std::vector<uint8_t> slab = interleaved_slab(n);
+    std::vector<uint8_t> digests(n * DIGEST_BYTES);
+    std::vector<uint8_t> ok(n);
+
+    EXPECT_EQ(quids_process_batch(slab.data(), n, digests.data(), ok.data()), n - 1);
+    EXPECT_EQ(ok[9], 0);
+}
+
+// The vector path writes whole 32-byte chunks and must hand the tail and the
+// advanced state over to the scalar streams seamlessly
+TEST(RealtimeBenchNativeTest, FillRandomMatchesXorshift128Plus) {
+    const uint64_t seed[8] = {1, 3, 5, 7, 0x9E3779B97F4A7C15ULL, 11, 13, 15};
+    for (size_t len : {size_t{0}, size_t{5}, size_t{32}, size_t{100}, size_t{1024}}) {
+        SCOPED_TRACE("len = " + std::to_string(len));
+        uint64_t state[8];
+        uint64_t expected_state[8];
+        std::memcpy(state, seed, sizeof(state));
+        std::memcpy(expected_state, seed, sizeof(expected_state));
+
+        std::vector<uint8_t> expected(len + 32);
+        for (size_t i = 0; i < len; i += 32) {
+            for (size_t lane = 0; lane < 4; ++lane) {
+                const uint64_t word = xorshift128p(expected_state[lane], expected_state[4 + lane]);
+                std::memcpy(&expected[i + 8 * lane], &word, sizeof(word));
+            }
+        }
+        expected.resize(len);
+
+        std::vector<uint8_t> buf(len);
+        quids_fill_random(state, buf.data(), len);
+        EXPECT_EQ(buf, expected);
+        EXPECT_EQ(0, std::memcmp(state, expected_state, sizeof(state)));
+    }
+}